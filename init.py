@@ -4,12 +4,10 @@
 支持交互式和命令行两种方式选择、复制和编译模板
 """
 
+import functools
 import os
+import stat
 import sys
-import shutil
-import subprocess
-import argparse
-from datetime import datetime
 from pathlib import Path
 
 # 模板配置
@@ -49,25 +47,116 @@ SLIDE_TEMPLATES = {
     }
 }
 
+# 模板键名和交互式菜单只依赖上面的配置，在导入时生成一次
+_REPORT_KEYS = tuple(REPORT_TEMPLATES)
+_SLIDE_KEYS = tuple(SLIDE_TEMPLATES)
+_REPORT_MENU = "\n".join(
+    ["0. 不选择"]
+    + [f"{i}. {template['name']} ({key})" for i, (key, template) in enumerate(REPORT_TEMPLATES.items(), 1)]
+)
+_SLIDE_MENU = "\n".join(
+    ["0. 不选择"]
+    + [f"{i}. {template['name']} ({key})" for i, (key, template) in enumerate(SLIDE_TEMPLATES.items(), 1)]
+)
+
+# 命令行帮助信息；单独的 -h/--help 直接输出 _STATIC_HELP_TEXT，无需构造 ArgumentParser
+# _STATIC_HELP_TEXT 按 argparse 在 80 列终端下以 init.py 运行时的排版书写，
+# 其他终端宽度下 argparse 的换行位置会不同，内容相同
+_HELP_DESCRIPTION = '模板管理脚本 - 选择、复制和编译模板'
+_HELP_EPILOG = """
+        示例:
+        # 交互式选择
+        python init.py
+
+        # 命令行选择 latex_exp + beamer
+        python init.py --report latex_exp --slide beamer
+
+        # 选择 markdown + reveal-md，指定路径
+        python init.py --report markdown_template --slide reveal-md --target ~/my_project
+
+        # 只选择 slide
+        python init.py --slide beamer --target ~/presentation
+
+        # 选择 PPT 模板
+        python init.py --slide ppt --ppt-template beamer_type.pptx --target ~/presentation
+
+        # 只复制模板，不编译
+        python init.py --report latex_exp --no-compile
+
+        # 守护进程模式：先启动守护进程，之后的请求由常驻进程处理
+        python init.py --daemon
+        python init.py --client --report latex_exp --target ~/my_project
+        """
+_STATIC_HELP_TEXT = (
+    "usage: {prog} [-h] [--report {{" + ",".join(_REPORT_KEYS) + "}}]\n"
+    "{indent}[--slide {{" + ",".join(_SLIDE_KEYS) + "}}] [--ppt-template PPT_TEMPLATE]\n"
+    "{indent}[--target TARGET] [--no-compile] [--daemon | --client]\n"
+    "\n"
+    + _HELP_DESCRIPTION + "\n"
+    "\n"
+    # Python 3.10 之前 argparse 的标题为 "optional arguments:"
+    + ("options:\n" if sys.version_info >= (3, 10) else "optional arguments:\n")
+    + "  -h, --help            show this help message and exit\n"
+    "  --report {{" + ",".join(_REPORT_KEYS) + "}}\n"
+    "                        选择 Report 模板\n"
+    "  --slide {{" + ",".join(_SLIDE_KEYS) + "}}\n"
+    "                        选择 Slide 模板\n"
+    "  --ppt-template PPT_TEMPLATE\n"
+    "                        PPT 模板文件名（当 --slide ppt 时必需）\n"
+    "  --target TARGET       目标路径（默认: ~/Downloads/template_project_TIMESTAMP）\n"
+    "  --no-compile, --copy-only\n"
+    "                        只复制模板，跳过编译\n"
+    "  --daemon              以守护进程模式运行，在 Unix 套接字上等待 --client 请求\n"
+    "  --client              将本次请求交给已运行的守护进程执行\n"
+    + _HELP_EPILOG
+)
+
 # 获取脚本所在目录（模板仓库根目录）
 SCRIPT_DIR = Path(__file__).parent.absolute()
 
+# 预先计算各模板的绝对源路径（字符串），复制时按键直接取用
+for _template in (*REPORT_TEMPLATES.values(), *SLIDE_TEMPLATES.values()):
+    _template['abs_path'] = os.path.join(SCRIPT_DIR, _template['path'])
+del _template
+
+# 复制模板时忽略的文件（编译产物、缓存等）
+IGNORE_SUFFIXES = frozenset({
+    '.aux', '.log', '.out', '.toc', '.bbl', '.blg', '.fls',
+    '.fdb_latexmk', '.nav', '.snm', '.vrb', '.pdf', '.pyc'
+})
+IGNORE_COMPOUND_SUFFIXES = ('.synctex.gz',)
+IGNORE_NAMES = frozenset({'site', '__pycache__', '.git'})
+
+# Linux ioctl：在 CoW 文件系统上克隆整个文件（<linux/fs.h> 中的 _IOW(0x94, 9, int)）
+FICLONE = 0x40049409
+
+# 编译失败时重新输出的 make 日志行数
+MAKE_TAIL_LINES = 200
+
+# 查找 Makefile 时不会进入的目录
+MAKEFILE_SKIP_DIRS = frozenset({'.git', '__pycache__', 'site', 'node_modules'})
+
 
 def get_default_target_path():
     """生成默认目标路径：~/Downloads/template_project_TIMESTAMP"""
+    import time
+
     downloads_dir = Path.home() / 'Downloads'
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    timestamp = time.strftime('%Y%m%d_%H%M%S')
     return downloads_dir / f'template_project_{timestamp}'
 
 
+@functools.lru_cache(maxsize=1)
 def list_ppt_templates():
-    """列出可用的 PPT 模板"""
-    ppt_dir = SCRIPT_DIR / 'PPT' / 'templates'
-    if not ppt_dir.exists():
-        return []
+    """列出可用的 PPT 模板（结果在进程内缓存，返回元组）"""
+    ppt_dir = os.path.join(SCRIPT_DIR, 'PPT', 'templates')
+    try:
+        with os.scandir(ppt_dir) as it:
+            ppt_files = [entry.name for entry in it if entry.name.endswith('.pptx')]
+    except (FileNotFoundError, NotADirectoryError):
+        return ()
     
-    ppt_files = [f.name for f in ppt_dir.glob('*.pptx')]
-    return sorted(ppt_files)
+    return tuple(sorted(ppt_files))
 
 
 def select_templates_interactive():
@@ -78,17 +167,15 @@ def select_templates_interactive():
     
     # 选择 Report 模板
     print("\n[Report 类模板]")
-    print("0. 不选择")
-    for i, (key, template) in enumerate(REPORT_TEMPLATES.items(), 1):
-        print(f"{i}. {template['name']} ({key})")
+    print(_REPORT_MENU)
     
-    report_choice = input("\n请选择 Report 模板 (0-{}): ".format(len(REPORT_TEMPLATES)))
+    report_choice = input(f"\n请选择 Report 模板 (0-{len(_REPORT_KEYS)}): ")
     try:
         report_idx = int(report_choice)
         if report_idx == 0:
             report_template = None
-        elif 1 <= report_idx <= len(REPORT_TEMPLATES):
-            report_template = list(REPORT_TEMPLATES.keys())[report_idx - 1]
+        elif 1 <= report_idx <= len(_REPORT_KEYS):
+            report_template = _REPORT_KEYS[report_idx - 1]
         else:
             print("无效选择，将不选择 Report 模板")
             report_template = None
@@ -98,18 +185,16 @@ def select_templates_interactive():
     
     # 选择 Slide 模板
     print("\n[Slide 类模板]")
-    print("0. 不选择")
-    for i, (key, template) in enumerate(SLIDE_TEMPLATES.items(), 1):
-        print(f"{i}. {template['name']} ({key})")
+    print(_SLIDE_MENU)
     
-    slide_choice = input("\n请选择 Slide 模板 (0-{}): ".format(len(SLIDE_TEMPLATES)))
+    slide_choice = input(f"\n请选择 Slide 模板 (0-{len(_SLIDE_KEYS)}): ")
     try:
         slide_idx = int(slide_choice)
         if slide_idx == 0:
             slide_template = None
             ppt_template = None
-        elif 1 <= slide_idx <= len(SLIDE_TEMPLATES):
-            slide_key = list(SLIDE_TEMPLATES.keys())[slide_idx - 1]
+        elif 1 <= slide_idx <= len(_SLIDE_KEYS):
+            slide_key = _SLIDE_KEYS[slide_idx - 1]
             slide_template = slide_key
             
             # 如果是 PPT 模板，需要选择具体的 .pptx 文件
@@ -158,42 +243,33 @@ def select_templates_interactive():
     else:
         target_path = default_path
     
-    return report_template, slide_template, ppt_template, target_path
+    # 是否编译（只搭建项目时可跳过，避免耗时的 make）
+    compile_choice = input("\n是否编译模板? (Y/n): ").strip().lower()
+    compile_enabled = compile_choice != 'n'
+    
+    return report_template, slide_template, ppt_template, target_path, compile_enabled
 
 
 def parse_arguments():
     """解析命令行参数"""
+    import argparse
+
+    # 修改参数时需同步更新 _STATIC_HELP_TEXT
     parser = argparse.ArgumentParser(
-        description='模板管理脚本 - 选择、复制和编译模板',
+        description=_HELP_DESCRIPTION,
         formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-        示例:
-        # 交互式选择
-        python init.py
-
-        # 命令行选择 latex_exp + beamer
-        python init.py --report latex_exp --slide beamer
-
-        # 选择 markdown + reveal-md，指定路径
-        python init.py --report markdown_template --slide reveal-md --target ~/my_project
-
-        # 只选择 slide
-        python init.py --slide beamer --target ~/presentation
-
-        # 选择 PPT 模板
-        python init.py --slide ppt --ppt-template beamer_type.pptx --target ~/presentation
-        """
+        epilog=_HELP_EPILOG
     )
     
     parser.add_argument(
         '--report',
-        choices=list(REPORT_TEMPLATES.keys()),
+        choices=_REPORT_KEYS,
         help='选择 Report 模板'
     )
     
     parser.add_argument(
         '--slide',
-        choices=list(SLIDE_TEMPLATES.keys()),
+        choices=_SLIDE_KEYS,
         help='选择 Slide 模板'
     )
     
@@ -207,10 +283,246 @@ def parse_arguments():
         help='目标路径（默认: ~/Downloads/template_project_TIMESTAMP）'
     )
     
+    parser.add_argument(
+        '--no-compile', '--copy-only',
+        action='store_true',
+        help='只复制模板，跳过编译'
+    )
+    
+    mode_group = parser.add_mutually_exclusive_group()
+    mode_group.add_argument(
+        '--daemon',
+        action='store_true',
+        help='以守护进程模式运行，在 Unix 套接字上等待 --client 请求'
+    )
+    mode_group.add_argument(
+        '--client',
+        action='store_true',
+        help='将本次请求交给已运行的守护进程执行'
+    )
+    
     return parser.parse_args()
 
 
-def copy_template(template_key, template_info, target_path, template_type=None, is_ppt=False, ppt_filename=None):
+def _copy_metadata(st, dst):
+    """将已获取的 stat 结果（权限和时间戳）应用到 dst，避免再次 stat 源文件"""
+    os.chmod(dst, stat.S_IMODE(st.st_mode))
+    os.utime(dst, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+
+@functools.lru_cache(maxsize=1)
+def _macos_clonefile():
+    """返回 macOS libc 中的 clonefile 函数（macOS 10.12+），不可用时返回 None"""
+    import ctypes
+
+    try:
+        clonefile = ctypes.CDLL(None).clonefile
+    except (OSError, AttributeError):
+        return None
+    clonefile.argtypes = (ctypes.c_char_p, ctypes.c_char_p, ctypes.c_uint32)
+    clonefile.restype = ctypes.c_int
+    return clonefile
+
+
+def _fast_copy(src, dst, size=None):
+    """使用平台原生接口复制单个文件内容（不含元数据）
+
+    Windows 使用 CopyFile2；Linux 优先尝试 FICLONE 克隆（btrfs/XFS 等 CoW 文件系统上
+    不复制数据），再使用 copy_file_range（支持服务端复制），不支持时依次退回到 sendfile
+    和普通的读写复制；macOS 优先尝试 clonefile（APFS 上写时复制克隆），失败时与其他平台
+    一样交给 shutil.copyfile（macOS 上使用 fcopyfile）。
+    
+    不使用硬链接：用户原地编辑复制出的文件时会同时修改仓库中的模板。
+    
+    size 为源文件大小（调用方已有 stat 结果时传入，否则在此获取）。部分文件系统
+    （procfs、某些 FUSE/网络挂载）不支持 copy_file_range/sendfile 却直接返回 0，
+    因此非空文件一个字节都没复制时会退回到下一种方式。
+    """
+    if sys.platform == 'win32':
+        import ctypes
+        from ctypes import wintypes
+
+        copy_file2 = ctypes.windll.kernel32.CopyFile2
+        copy_file2.argtypes = (wintypes.LPCWSTR, wintypes.LPCWSTR, ctypes.c_void_p)
+        # HRESULT 返回值为失败码时 ctypes 会自动抛出 OSError
+        copy_file2.restype = ctypes.HRESULT
+        copy_file2(os.fspath(src), os.fspath(dst), None)
+        return
+
+    import shutil
+
+    if not sys.platform.startswith('linux'):
+        if sys.platform == 'darwin':
+            clonefile = _macos_clonefile()
+            # 目标已存在、非 APFS、跨卷等情况下会失败，此时由 shutil.copyfile 复制（并报告真正的错误）
+            if clonefile is not None and clonefile(os.fsencode(src), os.fsencode(dst), 0) == 0:
+                return
+        shutil.copyfile(src, dst)
+        return
+
+    import errno
+    import fcntl
+
+    fallback_errnos = (errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP)
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        in_fd, out_fd = fsrc.fileno(), fdst.fileno()
+        if size is None:
+            size = os.fstat(in_fd).st_size
+        try:
+            fcntl.ioctl(out_fd, FICLONE, in_fd)
+            return
+        except OSError as e:
+            if e.errno not in fallback_errnos + (errno.ENOTTY, errno.EBADF, errno.EPERM):
+                raise
+        # 以下系统调用均从当前文件偏移处继续，失败后可以无缝退回到下一种方式
+        if hasattr(os, 'copy_file_range'):
+            copied = 0
+            try:
+                while sent := os.copy_file_range(in_fd, out_fd, 1 << 30):
+                    copied += sent
+            except OSError as e:
+                if e.errno not in fallback_errnos:
+                    raise
+            else:
+                if copied or not size:
+                    return
+        if hasattr(os, 'sendfile'):
+            copied = 0
+            try:
+                while sent := os.sendfile(out_fd, in_fd, None, 1 << 30):
+                    copied += sent
+            except OSError as e:
+                if e.errno not in fallback_errnos:
+                    raise
+            else:
+                if copied or not size:
+                    return
+        shutil.copyfileobj(fsrc, fdst)
+
+
+def _copy_file(src, dst, st):
+    """复制单个文件并应用源文件的元数据"""
+    _fast_copy(src, dst, st.st_size)
+    _copy_metadata(st, dst)
+
+
+def _is_ignored(name):
+    """判断复制模板时是否忽略该文件或目录（集合查找，无需逐个匹配通配符）"""
+    return (name in IGNORE_NAMES
+            or os.path.splitext(name)[1] in IGNORE_SUFFIXES
+            or name.endswith(IGNORE_COMPOUND_SUFFIXES))
+
+
+def _collect_tree(src, dst, files, dirs):
+    """创建目标目录结构，并收集需要复制的文件和需要应用元数据的目录"""
+    os.makedirs(dst)
+    dirs.append((src, dst))
+    with os.scandir(src) as it:
+        for entry in it:
+            if _is_ignored(entry.name):
+                continue
+            target = os.path.join(dst, entry.name)
+            if entry.is_dir():
+                _collect_tree(entry.path, target, files, dirs)
+            else:
+                files.append((entry.path, target, entry.stat()))
+
+
+def _fast_copytree(src, dst):
+    """基于 os.scandir 的目录复制，复用 DirEntry 缓存的 stat 信息
+
+    行为与 shutil.copytree(src, dst, ignore=...) 一致：目标目录不能已存在，
+    符号链接会被跟随并复制其内容。目录结构串行创建，文件在线程池中并行复制。
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    # 遍历过程中统一使用字符串路径，避免逐个文件构造 Path 对象
+    files = []
+    dirs = []
+    _collect_tree(os.fspath(src), os.fspath(dst), files, dirs)
+    
+    if files:
+        srcs, dsts, stats = zip(*files)
+        with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as executor:
+            # 消费迭代器，使复制中的异常在此处抛出
+            list(executor.map(_copy_file, srcs, dsts, stats))
+    
+    # 文件写入会改变目录的修改时间，因此最后由深到浅应用目录元数据
+    for dir_src, dir_dst in reversed(dirs):
+        _copy_metadata(os.stat(dir_src), dir_dst)
+
+
+def _remove(entry):
+    """删除 DirEntry 对应的文件或目录（不跟随符号链接）"""
+    import shutil
+
+    if entry.is_dir(follow_symlinks=False):
+        shutil.rmtree(entry.path)
+    else:
+        os.unlink(entry.path)
+
+
+def _sync_tree(src, dst):
+    """将 src 增量同步到 dst，效果等同于删除 dst 后重新 _fast_copytree
+    
+    复制时目标文件会得到与源文件完全相同的修改时间，因此大小和纳秒级修改时间都相同的
+    普通文件视为未改动，只重新应用元数据而不复制内容；其余文件重新复制，dst 中多余的文件会被删除。
+    """
+    src, dst = os.fspath(src), os.fspath(dst)
+    os.makedirs(dst, exist_ok=True)
+    with os.scandir(dst) as it:
+        existing = {entry.name: entry for entry in it}
+    
+    with os.scandir(src) as it:
+        for entry in it:
+            if _is_ignored(entry.name):
+                continue
+            target = os.path.join(dst, entry.name)
+            old = existing.pop(entry.name, None)
+            if entry.is_dir():
+                if old is not None and not old.is_dir(follow_symlinks=False):
+                    os.unlink(target)
+                _sync_tree(entry.path, target)
+                continue
+            
+            st = entry.stat()
+            if old is not None:
+                if old.is_file(follow_symlinks=False):
+                    old_st = old.stat(follow_symlinks=False)
+                    if old_st.st_size == st.st_size and old_st.st_mtime_ns == st.st_mtime_ns:
+                        _copy_metadata(st, target)
+                        continue
+                # 先删除再复制，避免写穿符号链接或硬链接
+                _remove(old)
+            _copy_file(entry.path, target, st)
+    
+    for old in existing.values():
+        _remove(old)
+    _copy_metadata(os.stat(src), dst)
+
+
+def _print_line(text):
+    """用一次写操作输出一行，避免并行任务的输出在行内交错（print 会分两次写入换行符）"""
+    sys.stdout.write(f"{text}\n")
+
+
+def _template_target_path(template_key, target_path, template_type=None):
+    """模板在目标路径中的位置：根据类型放到 report 或 slide 文件夹"""
+    if template_type == 'report':
+        return target_path / 'report'
+    elif template_type == 'slide':
+        return target_path / 'slide'
+    # 如果没有指定类型，使用原来的方式（向后兼容）
+    return target_path / template_key
+
+
+def _confirm_overwrite(target_template_path):
+    """询问是否覆盖已存在的模板目录"""
+    response = input(f"目标路径已存在: {target_template_path}\n是否覆盖? (y/N): ").strip().lower()
+    return response == 'y'
+
+
+def copy_template(template_key, template_info, target_path, template_type=None, is_ppt=False, ppt_filename=None, overwrite=None):
     """复制模板到目标路径
     
     Args:
@@ -220,159 +532,500 @@ def copy_template(template_key, template_info, target_path, template_type=None,
         template_type: 模板类型 ('report' 或 'slide')
         is_ppt: 是否为 PPT 模板
         ppt_filename: PPT 文件名
+        overwrite: 目标已存在时是否覆盖，None 表示交互式询问
     """
-    source_path = SCRIPT_DIR / template_info['path']
+    source_path = template_info['abs_path']
     
-    if not source_path.exists():
-        print(f"错误: 模板路径不存在: {source_path}")
+    if not os.path.exists(source_path):
+        _print_line(f"错误: 模板路径不存在: {source_path}")
         return False
     
     if is_ppt and ppt_filename:
         # PPT 模板：只复制单个文件到 slide 文件夹
-        source_file = source_path / ppt_filename
-        if not source_file.exists():
-            print(f"错误: PPT 模板文件不存在: {source_file}")
+        source_file = os.path.join(source_path, ppt_filename)
+        try:
+            source_stat = os.stat(source_file)
+        except FileNotFoundError:
+            _print_line(f"错误: PPT 模板文件不存在: {source_file}")
             return False
         
         slide_dir = target_path / 'slide'
         slide_dir.mkdir(parents=True, exist_ok=True)
-        target_file = slide_dir / ppt_filename
-        shutil.copy2(source_file, target_file)
-        print(f"✓ 已复制 PPT 模板: {ppt_filename} -> {slide_dir}")
+        target_file = os.path.join(slide_dir, ppt_filename)
+        _fast_copy(source_file, target_file, source_stat.st_size)
+        _copy_metadata(source_stat, target_file)
+        _print_line(f"✓ 已复制 PPT 模板: {ppt_filename} -> {slide_dir}")
         return True
     else:
         # 其他模板：根据类型复制到 report 或 slide 文件夹
-        if template_type == 'report':
-            target_template_path = target_path / 'report'
-        elif template_type == 'slide':
-            target_template_path = target_path / 'slide'
-        else:
-            # 如果没有指定类型，使用原来的方式（向后兼容）
-            target_template_path = target_path / template_key
+        target_template_path = _template_target_path(template_key, target_path, template_type)
         
         if target_template_path.exists():
-            response = input(f"目标路径已存在: {target_template_path}\n是否覆盖? (y/N): ").strip().lower()
-            if response != 'y':
-                print("已取消复制")
+            if overwrite is None:
+                overwrite = _confirm_overwrite(target_template_path)
+            if not overwrite:
+                _print_line(f"目标路径已存在: {target_template_path}，已取消复制")
                 return False
-            shutil.rmtree(target_template_path)
-        
-        shutil.copytree(source_path, target_template_path, ignore=shutil.ignore_patterns(
-            '*.aux', '*.log', '*.out', '*.toc', '*.synctex.gz', '*.bbl', '*.blg',
-            '*.fls', '*.fdb_latexmk', '*.nav', '*.snm', '*.vrb', '*.pdf',
-            '*.aux', 'site', '__pycache__', '*.pyc', '.git'
-        ))
-        print(f"✓ 已复制模板: {template_key} -> {target_template_path}")
+            # 增量覆盖：只复制有变化的文件，并删除模板中不存在的文件
+            _sync_tree(source_path, target_template_path)
+        else:
+            _fast_copytree(source_path, target_template_path)
+        _print_line(f"✓ 已复制模板: {template_key} -> {target_template_path}")
         return True
 
 
 def find_makefile(base_path):
     """查找 Makefile 位置"""
+    base = os.fspath(base_path)
+    
     # 首先检查根目录
-    makefile_path = base_path / 'Makefile'
-    if makefile_path.exists():
-        return base_path
+    if os.path.isfile(os.path.join(base, 'Makefile')):
+        return Path(base)
     
     # 检查常见子目录
     common_subdirs = ['slide/src', 'src', 'slide']
     for subdir in common_subdirs:
-        subdir_path = base_path / subdir
-        makefile_path = subdir_path / 'Makefile'
-        if makefile_path.exists():
-            return subdir_path
-    
-    # 递归查找（最多3层）
-    for root, dirs, files in os.walk(base_path):
-        depth = root[len(str(base_path)):].count(os.sep)
-        if depth > 3:
+        subdir_path = os.path.join(base, subdir)
+        if os.path.isfile(os.path.join(subdir_path, 'Makefile')):
+            return Path(subdir_path)
+    
+    # 广度优先查找（最多3层），找到第一个即返回
+    from collections import deque
+
+    queue = deque([(base, 0)])
+    while queue:
+        current, depth = queue.popleft()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.name == 'Makefile' and entry.is_file():
+                        return Path(current)
+                    if (depth < 3 and entry.name not in MAKEFILE_SKIP_DIRS
+                            and entry.is_dir(follow_symlinks=False)):
+                        queue.append((entry.path, depth + 1))
+        except OSError:
             continue
-        if 'Makefile' in files:
-            return Path(root)
     
     return None
 
 
-def compile_template(template_key, template_info, target_path, template_type=None):
-    """编译模板（使用 Makefile）
+def _prepare_compile(template_key, template_info, target_path, template_type=None):
+    """确定模板是否需要编译，并查找其 Makefile 所在目录
     
-    Args:
-        template_key: 模板键名
-        template_info: 模板信息字典
-        target_path: 目标路径
-        template_type: 模板类型 ('report' 或 'slide')
+    Returns:
+        (makefile_dir, ok): makefile_dir 为 None 时无需启动 make，ok 为该模板的编译结果
     """
     if not template_info['has_makefile']:
         print(f"模板 {template_key} 不需要编译")
-        return True
+        return None, True
     
     # 确定模板在目标路径中的位置
     if template_key == 'ppt':
         # PPT 模板不需要编译
-        return True
+        return None, True
     
     # 根据类型确定模板路径
-    if template_type == 'report':
-        template_target_path = target_path / 'report'
-    elif template_type == 'slide':
-        template_target_path = target_path / 'slide'
-    else:
-        # 向后兼容：使用原来的方式
-        template_target_path = target_path / template_key
+    template_target_path = _template_target_path(template_key, target_path, template_type)
     
     # 查找 Makefile
     makefile_dir = find_makefile(template_target_path)
     
     if makefile_dir is None:
         print(f"警告: 未找到 {template_key} 的 Makefile，跳过编译")
-        return False
+        return None, False
     
     print(f"找到 Makefile 在: {makefile_dir}")
-    print(f"正在编译 {template_key}...")
+    return makefile_dir, True
+
+
+def _make_command():
+    """构造并行 make 命令：-j 为 CPU 核数
     
+    不使用 --output-sync：它会把每个目标的输出攒到目标结束才输出，
+    单个 latexmk 目标会在整个编译过程中没有任何输出。各行已带模板名前缀，无需同步。
+    """
+    return ['make', f'-j{os.cpu_count() or 2}']
+
+
+def _start_make(makefile_dir):
+    """在 makefile_dir 中启动 make（不等待结束），失败时返回 None"""
+    import subprocess
+
     try:
-        # 运行 make
-        result = subprocess.run(
-            ['make'],
+        return subprocess.Popen(
+            _make_command(),
             cwd=makefile_dir,
-            check=False,
-            capture_output=True,
-            text=True
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            errors='replace',
+            bufsize=1
         )
-        
-        if result.returncode == 0:
-            print(f"✓ {template_key} 编译成功")
-            return True
-        else:
-            print(f"✗ {template_key} 编译失败")
-            if result.stdout:
-                print("标准输出:")
-                print(result.stdout)
-            if result.stderr:
-                print("错误输出:")
-                print(result.stderr)
-            return False
     except FileNotFoundError:
         print("错误: 未找到 make 命令，请确保已安装 make")
-        return False
     except Exception as e:
         print(f"编译时发生错误: {e}")
+    return None
+
+
+def _finalize_make(proc, template_key):
+    """逐行输出 make 的日志并等待其结束
+    
+    每行带上模板名前缀，因此可以在多个线程中同时等待不同的 make 进程；
+    同时保留最后 MAKE_TAIL_LINES 行，失败时集中重新输出，避免与并行编译的日志混在一起。
+    """
+    from collections import deque
+
+    if proc is None:
+        return False
+    
+    tail = deque(maxlen=MAKE_TAIL_LINES)
+    try:
+        with proc.stdout:
+            for line in proc.stdout:
+                print(f"[{template_key}] {line}", end='')
+                tail.append(line)
+        proc.wait()
+    except Exception as e:
+        _print_line(f"编译时发生错误: {e}")
+        return False
+    
+    if proc.returncode == 0:
+        _print_line(f"✓ {template_key} 编译成功")
+        return True
+    
+    # 一次性输出，避免与另一个模板的实时日志交错
+    _print_line(f"✗ {template_key} 编译失败（make 退出码 {proc.returncode}）\n"
+                f"最后 {len(tail)} 行输出:\n{''.join(tail).rstrip()}")
+    return False
+
+
+def _compile_templates(report_template, slide_template, target_path):
+    """并行编译选中的模板，返回是否全部成功"""
+    from concurrent.futures import ThreadPoolExecutor
+
+    compile_success = True
+    compile_jobs = []
+    
+    if report_template:
+        compile_jobs.append((report_template, REPORT_TEMPLATES[report_template], 'report'))
+    
+    if slide_template and slide_template != 'ppt':
+        compile_jobs.append((slide_template, SLIDE_TEMPLATES[slide_template], 'slide'))
+    
+    # 先启动所有 make 进程，再统一等待，使 report 和 slide 并行编译
+    running = []
+    for template_key, template_info, template_type in compile_jobs:
+        makefile_dir, ok = _prepare_compile(template_key, template_info, target_path, template_type)
+        if makefile_dir is None:
+            if not ok:
+                compile_success = False
+            continue
+        print(f"正在编译 {template_key}...")
+        running.append((_start_make(makefile_dir), template_key))
+    
+    if running:
+        # 同时读取各进程的输出管道，实时输出日志，也避免某个进程因管道写满而阻塞
+        with ThreadPoolExecutor(max_workers=len(running)) as executor:
+            results = list(executor.map(_finalize_make, *zip(*running)))
+        if not all(results):
+            compile_success = False
+    
+    return compile_success
+
+
+def _print_selection(report_template, slide_template, ppt_template, target_path, compile_enabled):
+    """显示选择结果"""
+    print("\n" + "="*60)
+    print("选择的模板:")
+    print("="*60)
+    if report_template:
+        print(f"  Report: {REPORT_TEMPLATES[report_template]['name']}")
+    if slide_template:
+        if slide_template == 'ppt':
+            print(f"  Slide: {SLIDE_TEMPLATES[slide_template]['name']} ({ppt_template})")
+        else:
+            print(f"  Slide: {SLIDE_TEMPLATES[slide_template]['name']}")
+    print(f"  目标路径: {target_path}")
+    print(f"  编译: {'是' if compile_enabled else '否'}")
+    print("="*60 + "\n")
+
+
+def run_templates(report_template, slide_template, ppt_template, target_path, compile_enabled, overwrite=None):
+    """复制并（可选）编译选中的模板，复制失败时返回 False
+    
+    Args:
+        overwrite: 目标已存在时是否覆盖，None 表示交互式询问
+    """
+    # 创建目标目录
+    target_path.mkdir(parents=True, exist_ok=True)
+    
+    # 覆盖确认在开始并行复制之前依次询问，避免提示与另一个复制任务的输出交错
+    report_overwrite = slide_overwrite = overwrite
+    if overwrite is None:
+        if report_template:
+            report_path = _template_target_path(report_template, target_path, 'report')
+            if report_path.exists():
+                report_overwrite = _confirm_overwrite(report_path)
+        if slide_template and slide_template != 'ppt':
+            slide_path = _template_target_path(slide_template, target_path, 'slide')
+            if slide_path.exists():
+                slide_overwrite = _confirm_overwrite(slide_path)
+    
+    # 复制模板（report 和 slide 写入不同子目录，可并行复制）
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = []
+        if report_template:
+            template_info = REPORT_TEMPLATES[report_template]
+            futures.append(executor.submit(
+                copy_template, report_template, template_info, target_path,
+                template_type='report', overwrite=report_overwrite
+            ))
+        
+        if slide_template:
+            template_info = SLIDE_TEMPLATES[slide_template]
+            is_ppt = (slide_template == 'ppt')
+            futures.append(executor.submit(
+                copy_template, slide_template, template_info, target_path,
+                template_type='slide', is_ppt=is_ppt, ppt_filename=ppt_template,
+                overwrite=slide_overwrite
+            ))
+    
+    success = all([future.result() for future in futures])
+    
+    if not success:
+        print("\n复制过程中出现错误，请检查上述信息")
+        return False
+    
+    # 编译模板
+    if compile_enabled:
+        print("\n" + "="*60)
+        print("开始编译")
+        print("="*60 + "\n")
+        compile_success = _compile_templates(report_template, slide_template, target_path)
+    
+    # 总结
+    print("\n" + "="*60)
+    print("完成")
+    print("="*60)
+    print(f"模板已复制到: {target_path}")
+    if not compile_enabled:
+        print("已跳过编译")
+    elif compile_success:
+        print("所有模板编译成功！")
+    else:
+        print("部分模板编译失败，请检查上述错误信息")
+    print("="*60 + "\n")
+    
+    return True
+
+
+def _daemon_socket_path(create_dir=False):
+    """守护进程监听的 Unix 套接字路径
+    
+    未设置 XDG_RUNTIME_DIR 时放在临时目录下仅当前用户可访问（0700）的子目录中，
+    避免其他用户在共享的临时目录里抢先创建同名套接字。
+    """
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir:
+        return os.path.join(runtime_dir, 'template-init.sock')
+    
+    import tempfile
+
+    sock_dir = os.path.join(tempfile.gettempdir(), f'template-init-{os.getuid()}')
+    if create_dir:
+        try:
+            os.mkdir(sock_dir, 0o700)
+        except FileExistsError:
+            pass
+    return os.path.join(sock_dir, 'daemon.sock')
+
+
+def _check_daemon_path(sock_path):
+    """检查套接字所在目录和（已存在的）套接字文件属于当前用户，返回错误信息或 None"""
+    uid = os.getuid()
+    sock_dir = os.path.dirname(sock_path)
+    try:
+        dir_stat = os.lstat(sock_dir)
+    except FileNotFoundError:
+        return None
+    if (not stat.S_ISDIR(dir_stat.st_mode) or dir_stat.st_uid != uid
+            or stat.S_IMODE(dir_stat.st_mode) & 0o077):
+        return f"套接字目录不属于当前用户或权限过宽: {sock_dir}"
+    
+    try:
+        sock_stat = os.lstat(sock_path)
+    except FileNotFoundError:
+        return None
+    if not stat.S_ISSOCK(sock_stat.st_mode) or sock_stat.st_uid != uid:
+        return f"套接字文件不属于当前用户: {sock_path}"
+    return None
+
+
+def _handle_daemon_request(conn):
+    """处理一个客户端请求：输出重定向到连接，最后一行回复 JSON 结果"""
+    import io
+    import json
+    from contextlib import redirect_stdout
+
+    with conn.makefile('r', encoding='utf-8') as reader, \
+            io.TextIOWrapper(conn.makefile('wb'), encoding='utf-8', line_buffering=True) as writer:
+        line = reader.readline()
+        if not line:
+            # 连接探测（例如另一个守护进程检查套接字是否可用），没有请求内容
+            return
+        request = json.loads(line)
+        print(f"处理请求: {request}")
+        
+        # 请求逐个串行处理，因此可以安全地重定向全局 stdout（包括线程池中的输出）
+        with redirect_stdout(writer):
+            try:
+                report_template = request['report']
+                slide_template = request['slide']
+                ppt_template = request['ppt_template']
+                target_path = Path(request['target'])
+                compile_enabled = request['compile']
+                if report_template is not None and report_template not in _REPORT_KEYS:
+                    raise ValueError(f"未知的 Report 模板: {report_template}")
+                if slide_template is not None and slide_template not in _SLIDE_KEYS:
+                    raise ValueError(f"未知的 Slide 模板: {slide_template}")
+                if slide_template == 'ppt':
+                    # 守护进程常驻期间模板目录可能变化，重新列出；只接受目录中已有的文件名，
+                    # 避免 '../' 之类的路径复制 PPT/templates 之外的文件
+                    list_ppt_templates.cache_clear()
+                    if ppt_template not in list_ppt_templates():
+                        raise ValueError(f"未知的 PPT 模板文件: {ppt_template}")
+                _print_selection(report_template, slide_template, ppt_template, target_path, compile_enabled)
+                # 守护进程无法交互式确认，目标已存在时不覆盖
+                ok = run_templates(report_template, slide_template, ppt_template, target_path,
+                                   compile_enabled, overwrite=False)
+            except Exception as e:
+                print(f"错误: 处理请求时发生错误: {e}")
+                ok = False
+        writer.write(json.dumps({'ok': ok}) + '\n')
+
+
+def serve_daemon():
+    """守护进程模式：在 Unix 套接字上常驻，复用已初始化的解释器处理请求"""
+    import socket
+    from contextlib import suppress
+
+    if not hasattr(socket, 'AF_UNIX'):
+        print("错误: 当前平台不支持 Unix 套接字，无法使用守护进程模式")
+        sys.exit(1)
+    
+    sock_path = _daemon_socket_path(create_dir=True)
+    error = _check_daemon_path(sock_path)
+    if error:
+        print(f"错误: {error}")
+        sys.exit(1)
+    if os.path.exists(sock_path):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(sock_path)
+            except OSError:
+                # 上次未正常退出留下的套接字文件
+                os.unlink(sock_path)
+            else:
+                print(f"错误: 守护进程已在运行: {sock_path}")
+                sys.exit(1)
+    
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # 套接字文件仅当前用户可访问
+    old_umask = os.umask(0o177)
+    try:
+        server.bind(sock_path)
+    finally:
+        os.umask(old_umask)
+    server.listen()
+    print(f"守护进程已启动，监听: {sock_path}（Ctrl+C 退出）")
+    
+    try:
+        with server:
+            while True:
+                conn, _ = server.accept()
+                with conn:
+                    try:
+                        _handle_daemon_request(conn)
+                    except (OSError, ValueError) as e:
+                        print(f"请求处理失败: {e}")
+    except KeyboardInterrupt:
+        print("\n守护进程已退出")
+    finally:
+        with suppress(FileNotFoundError):
+            os.unlink(sock_path)
+
+
+def run_via_daemon(report_template, slide_template, ppt_template, target_path, compile_enabled):
+    """将请求交给守护进程执行并转发其输出，复制失败时返回 False"""
+    import json
+    import socket
+
+    if not hasattr(socket, 'AF_UNIX'):
+        print("错误: 当前平台不支持 Unix 套接字，无法使用守护进程模式")
+        return False
+    
+    request = {
+        'report': report_template,
+        'slide': slide_template,
+        'ppt_template': ppt_template,
+        'target': os.fspath(target_path),
+        'compile': compile_enabled,
+    }
+    sock_path = _daemon_socket_path()
+    error = _check_daemon_path(sock_path)
+    if error:
+        print(f"错误: {error}")
+        return False
+    
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(sock_path)
+        except OSError:
+            print("错误: 无法连接守护进程，请先运行 python init.py --daemon")
+            return False
+        sock.sendall((json.dumps(request) + '\n').encode('utf-8'))
+        
+        # 最后一行是 JSON 结果，其余行原样输出
+        last_line = None
+        with sock.makefile('r', encoding='utf-8') as reader:
+            for line in reader:
+                if last_line is not None:
+                    print(last_line, end='')
+                last_line = line
+    
+    try:
+        return json.loads(last_line)['ok']
+    except (TypeError, ValueError, KeyError):
+        print("错误: 守护进程返回了无效的结果")
         return False
 
 
 def main():
     """主函数"""
     # 检查是否在模板仓库根目录
-    if not (SCRIPT_DIR / 'latex_exp').exists():
+    if not os.path.isdir(REPORT_TEMPLATES['latex_exp']['abs_path']):
         print("错误: 请在模板仓库根目录运行此脚本")
         sys.exit(1)
     
     # 解析参数或使用交互式选择
     if len(sys.argv) > 1:
         # 命令行模式
+        if sys.argv[1:] in (['-h'], ['--help']):
+            prog = os.path.basename(sys.argv[0])
+            print(_STATIC_HELP_TEXT.format(prog=prog, indent=' ' * len(f'usage: {prog} ')))
+            return
         args = parse_arguments()
+        if args.daemon:
+            serve_daemon()
+            return
+        use_daemon = args.client
         report_template = args.report
         slide_template = args.slide
         ppt_template = args.ppt_template
+        compile_enabled = not args.no_compile
         
         if args.target:
             target_path = Path(args.target).expanduser().resolve()
@@ -390,82 +1043,32 @@ def main():
             sys.exit(1)
     else:
         # 交互式模式
-        report_template, slide_template, ppt_template, target_path = select_templates_interactive()
+        use_daemon = False
+        report_template, slide_template, ppt_template, target_path, compile_enabled = select_templates_interactive()
     
     # 验证至少选择了一个模板
     if not report_template and not slide_template:
         print("错误: 至少需要选择一个模板")
         sys.exit(1)
     
+    if use_daemon:
+        if not run_via_daemon(report_template, slide_template, ppt_template, target_path, compile_enabled):
+            sys.exit(1)
+        return
+    
     # 显示选择结果
-    print("\n" + "="*60)
-    print("选择的模板:")
-    print("="*60)
-    if report_template:
-        print(f"  Report: {REPORT_TEMPLATES[report_template]['name']}")
-    if slide_template:
-        if slide_template == 'ppt':
-            print(f"  Slide: {SLIDE_TEMPLATES[slide_template]['name']} ({ppt_template})")
-        else:
-            print(f"  Slide: {SLIDE_TEMPLATES[slide_template]['name']}")
-    print(f"  目标路径: {target_path}")
-    print("="*60 + "\n")
+    _print_selection(report_template, slide_template, ppt_template, target_path, compile_enabled)
     
     # 确认
     if len(sys.argv) == 1:  # 只在交互式模式下确认
-        confirm = input("确认开始复制和编译? (Y/n): ").strip().lower()
+        action = "复制和编译" if compile_enabled else "复制"
+        confirm = input(f"确认开始{action}? (Y/n): ").strip().lower()
         if confirm == 'n':
             print("已取消")
             sys.exit(0)
     
-    # 创建目标目录
-    target_path.mkdir(parents=True, exist_ok=True)
-    
-    # 复制模板
-    success = True
-    
-    if report_template:
-        template_info = REPORT_TEMPLATES[report_template]
-        if not copy_template(report_template, template_info, target_path, template_type='report'):
-            success = False
-    
-    if slide_template:
-        template_info = SLIDE_TEMPLATES[slide_template]
-        is_ppt = (slide_template == 'ppt')
-        if not copy_template(slide_template, template_info, target_path, template_type='slide', is_ppt=is_ppt, ppt_filename=ppt_template):
-            success = False
-    
-    if not success:
-        print("\n复制过程中出现错误，请检查上述信息")
+    if not run_templates(report_template, slide_template, ppt_template, target_path, compile_enabled):
         sys.exit(1)
-    
-    # 编译模板
-    print("\n" + "="*60)
-    print("开始编译")
-    print("="*60 + "\n")
-    
-    compile_success = True
-    
-    if report_template:
-        template_info = REPORT_TEMPLATES[report_template]
-        if not compile_template(report_template, template_info, target_path, template_type='report'):
-            compile_success = False
-    
-    if slide_template and slide_template != 'ppt':
-        template_info = SLIDE_TEMPLATES[slide_template]
-        if not compile_template(slide_template, template_info, target_path, template_type='slide'):
-            compile_success = False
-    
-    # 总结
-    print("\n" + "="*60)
-    print("完成")
-    print("="*60)
-    print(f"模板已复制到: {target_path}")
-    if compile_success:
-        print("所有模板编译成功！")
-    else:
-        print("部分模板编译失败，请检查上述错误信息")
-    print("="*60 + "\n")
 
 
 if __name__ == '__main__':